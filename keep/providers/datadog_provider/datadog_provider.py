@@ -4,10 +4,16 @@ Datadog Provider is a class that allows to ingest/digest data from Datadog.
 
 import dataclasses
 import datetime
+import hashlib
 import json
 import logging
 import os
+import re
+import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterator
 
 import pydantic
 import requests
@@ -18,6 +24,7 @@ from datadog_api_client.exceptions import (
     ForbiddenException,
     NotFoundException,
 )
+from datadog_api_client.rest import RESTClientObject
 from datadog_api_client.v1.api.events_api import EventsApi
 from datadog_api_client.v1.api.logs_api import LogsApi
 from datadog_api_client.v1.api.metrics_api import MetricsApi
@@ -43,6 +50,81 @@ from keep.providers.providers_factory import ProvidersFactory
 
 logger = logging.getLogger(__name__)
 
+# in-process cache for slow changing Datadog reads (e.g. list_monitors), shared
+# between provider instances of the same credentials: key -> (expires_at, value)
+_CACHE_TTL_SECONDS = 300
+_CACHE_MAXSIZE = 256
+_cache: dict[tuple, tuple[float, Any]] = {}
+_cache_lock = threading.Lock()
+
+# event titles look like "[P1] [Triggered] Some monitor", the priority is optional
+# and multi alert monitors add the group: "[P1] [Recovered on {host:a}] Some monitor"
+_TITLE_RE = re.compile(
+    r"^(?:\[(P\d)\]\s+)?(?:\[([^\]]+?)(?:\s+on\s+\{[^\]]*)?\]\s+)?(.*)$", re.DOTALL
+)
+
+# timeframes look like "15m" or "7d"
+_TIMEFRAME_RE = re.compile(r"(\d+)([smhdw])")
+_SECONDS_PER_UNIT = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+
+def _parse_tags(tags) -> dict:
+    """
+    Parse Datadog "key:value" tags into a dict, tags without a ":" are skipped.
+
+    Args:
+        tags (Iterable[str]): The tags to parse.
+
+    Returns:
+        dict: key -> value, values may contain ":" themselves.
+    """
+    return {
+        key: value
+        for key, _, value in (tag.partition(":") for tag in tags if ":" in tag)
+    }
+
+
+def _get_fingerprint(groups, monitor_id) -> str:
+    """
+    Fingerprint an alert on its groups and monitor_id (DatadogProvider.FINGERPRINT_FIELDS).
+
+    Same digest as BaseProvider.get_alert_fingerprint, without serializing
+    the whole AlertDto to a dict first.
+
+    Args:
+        groups (list): The groups (scopes) of the alert.
+        monitor_id: The id of the monitor that triggered the alert.
+
+    Returns:
+        str: hexdigest of the fingerprint.
+    """
+    fingerprint = hashlib.sha256()
+    for value in (groups, monitor_id):
+        if isinstance(value, (list, dict)):
+            value = json.dumps(value)
+        if value is not None:
+            fingerprint.update(str(value).encode())
+    return fingerprint.hexdigest()
+
+
+class _PooledApiClient(ApiClient):
+    """
+    ApiClient whose urllib3 pool keeps up to maxsize connections alive.
+
+    The stock ApiClient keeps 4 connections per host, connections opened by
+    more concurrent threads are discarded after each request and every new
+    one pays a TLS handshake.
+    """
+
+    def __init__(self, configuration: Configuration, maxsize: int):
+        self.connection_pool_maxsize = maxsize
+        super().__init__(configuration)
+
+    def _build_rest_client(self):
+        return RESTClientObject(
+            self.configuration, maxsize=self.connection_pool_maxsize
+        )
+
 
 @pydantic.dataclasses.dataclass
 class DatadogProviderAuthConfig:
@@ -185,6 +267,15 @@ class DatadogProvider(BaseTopologyProvider):
         ),
     ]
     FINGERPRINT_FIELDS = ["groups", "monitor_id"]
+    # events are pulled in time slices concurrently to overlap the round-trips
+    EVENTS_WINDOW = datetime.timedelta(days=1)
+    EVENTS_MAX_WORKERS = 8
+    EVENTS_PAGE_SIZE = 1000
+    MONITORS_UPDATE_MAX_WORKERS = 16
+    MONITORS_UPDATE_RETRIES = 3
+    MONITORS_UPDATE_MAX_BACKOFF = 60
+    # enough kept-alive connections for the largest concurrent fan-out
+    API_CONNECTION_POOL_MAXSIZE = max(EVENTS_MAX_WORKERS, MONITORS_UPDATE_MAX_WORKERS)
     WEBHOOK_PAYLOAD = json.dumps(
         {
             "body": "$EVENT_MSG",
@@ -218,9 +309,52 @@ class DatadogProvider(BaseTopologyProvider):
         "Muted": AlertStatus.SUPPRESSED,
     }
 
-    def convert_to_seconds(s):
-        seconds_per_unit = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
-        return int(s[:-1]) * seconds_per_unit[s[-1]]
+    # static endpoint definitions for mute/unmute, not exposed by datadog_api_client
+    _MUTE_ENDPOINT_SETTINGS = {
+        "auth": ["apiKeyAuth", "appKeyAuth", "AuthZ"],
+        "endpoint_path": "/api/v1/monitor/{monitor_id}/mute",
+        "response_type": (dict,),
+        "operation_id": "mute_monitor",
+        "http_method": "POST",
+        "version": "v1",
+    }
+    _MUTE_PARAMS_MAP = {
+        "monitor_id": {
+            "required": True,
+            "openapi_types": (int,),
+            "attribute": "monitor_id",
+            "location": "path",
+        },
+        "scope": {
+            "openapi_types": (str,),
+            "attribute": "scope",
+            "location": "query",
+        },
+        "end": {
+            "openapi_types": (int,),
+            "attribute": "end",
+            "location": "query",
+        },
+    }
+    _MUTE_HEADERS_MAP = {
+        "accept": ["application/json"],
+        "content_type": ["application/json"],
+    }
+    _UNMUTE_ENDPOINT_SETTINGS = {
+        **_MUTE_ENDPOINT_SETTINGS,
+        "endpoint_path": "/api/v1/monitor/{monitor_id}/unmute",
+    }
+    _UNMUTE_PARAMS_MAP = {
+        "monitor_id": _MUTE_PARAMS_MAP["monitor_id"],
+        "scope": _MUTE_PARAMS_MAP["scope"],
+    }
+
+    @staticmethod
+    def convert_to_seconds(s: str) -> int:
+        match = _TIMEFRAME_RE.fullmatch(s)
+        if not match:
+            raise ValueError(f"Invalid timeframe: {s}, expected e.g. 15m, 1h or 7d")
+        return int(match.group(1)) * _SECONDS_PER_UNIT[match.group(2)]
 
     def __init__(
         self, context_manager: ContextManager, provider_id: str, config: ProviderConfig
@@ -269,6 +403,29 @@ class DatadogProvider(BaseTopologyProvider):
             ]
         else:
             raise Exception("No authentication provided")
+        if self.configuration.access_token:
+            # the access token is refreshed on every instantiation, key on the
+            # provider itself so the cache survives between runs
+            credentials = [self.provider_id]
+        else:
+            credentials = [
+                self.authentication_config.api_key,
+                self.authentication_config.app_key,
+            ]
+        self._cache_namespace = hashlib.blake2b(
+            "|".join(
+                [
+                    self.context_manager.tenant_id or "",
+                    self.configuration.host or "",
+                    *credentials,
+                ]
+            ).encode(),
+            digest_size=16,
+        ).hexdigest()
+        # shared by all the calls of this provider so connections are kept alive
+        self._api_client = _PooledApiClient(
+            self.configuration, maxsize=DatadogProvider.API_CONNECTION_POOL_MAXSIZE
+        )
         # to be exposed
         self.to = None
         self._from = None
@@ -318,132 +475,121 @@ class DatadogProvider(BaseTopologyProvider):
     def mute_monitor(
         self,
         monitor_id: str,
-        groups: list = [],
-        end: datetime.datetime = datetime.datetime.now() + datetime.timedelta(days=1),
+        groups: list = None,
+        end: datetime.datetime = None,
     ):
+        # computed per call, a default argument would be evaluated once on import
+        if end is None:
+            end = datetime.datetime.now() + datetime.timedelta(days=1)
         self.logger.info("Muting monitor", extra={"monitor_id": monitor_id, "end": end})
         if isinstance(end, str):
             end = datetime.datetime.fromisoformat(end)
 
-        groups = ",".join(groups)
+        groups = ",".join(groups or [])
         if groups == "*":
             groups = ""
 
-        with ApiClient(self.configuration) as api_client:
-            endpoint = Endpoint(
-                settings={
-                    "auth": ["apiKeyAuth", "appKeyAuth", "AuthZ"],
-                    "endpoint_path": "/api/v1/monitor/{monitor_id}/mute",
-                    "response_type": (dict,),
-                    "operation_id": "mute_monitor",
-                    "http_method": "POST",
-                    "version": "v1",
-                },
-                params_map={
-                    "monitor_id": {
-                        "required": True,
-                        "openapi_types": (int,),
-                        "attribute": "monitor_id",
-                        "location": "path",
-                    },
-                    "scope": {
-                        "openapi_types": (str,),
-                        "attribute": "scope",
-                        "location": "query",
-                    },
-                    "end": {
-                        "openapi_types": (int,),
-                        "attribute": "end",
-                        "location": "query",
-                    },
-                },
-                headers_map={
-                    "accept": ["application/json"],
-                    "content_type": ["application/json"],
-                },
-                api_client=api_client,
-            )
-            endpoint.call_with_http_info(
-                monitor_id=int(monitor_id),
-                end=int(end.timestamp()),
-                scope=groups,
-            )
+        endpoint = Endpoint(
+            settings=DatadogProvider._MUTE_ENDPOINT_SETTINGS,
+            params_map=DatadogProvider._MUTE_PARAMS_MAP,
+            headers_map=DatadogProvider._MUTE_HEADERS_MAP,
+            api_client=self._api_client,
+        )
+        endpoint.call_with_http_info(
+            monitor_id=int(monitor_id),
+            end=int(end.timestamp()),
+            scope=groups,
+        )
+        # downtimes changed
+        self._invalidate_cache()
         self.logger.info("Monitor muted", extra={"monitor_id": monitor_id})
 
     def unmute_monitor(
         self,
         monitor_id: str,
-        groups: list = [],
+        groups: list = None,
     ):
         self.logger.info("Unmuting monitor", extra={"monitor_id": monitor_id})
 
-        groups = ",".join(groups)
-
-        with ApiClient(self.configuration) as api_client:
-            endpoint = Endpoint(
-                settings={
-                    "auth": ["apiKeyAuth", "appKeyAuth", "AuthZ"],
-                    "endpoint_path": "/api/v1/monitor/{monitor_id}/unmute",
-                    "response_type": (dict,),
-                    "operation_id": "mute_monitor",
-                    "http_method": "POST",
-                    "version": "v1",
-                },
-                params_map={
-                    "monitor_id": {
-                        "required": True,
-                        "openapi_types": (int,),
-                        "attribute": "monitor_id",
-                        "location": "path",
-                    },
-                    "scope": {
-                        "openapi_types": (str,),
-                        "attribute": "scope",
-                        "location": "query",
-                    },
-                },
-                headers_map={
-                    "accept": ["application/json"],
-                    "content_type": ["application/json"],
-                },
-                api_client=api_client,
-            )
-            endpoint.call_with_http_info(
-                monitor_id=int(monitor_id),
-                scope=groups,
-            )
+        groups = ",".join(groups or [])
+
+        endpoint = Endpoint(
+            settings=DatadogProvider._UNMUTE_ENDPOINT_SETTINGS,
+            params_map=DatadogProvider._UNMUTE_PARAMS_MAP,
+            headers_map=DatadogProvider._MUTE_HEADERS_MAP,
+            api_client=self._api_client,
+        )
+        endpoint.call_with_http_info(
+            monitor_id=int(monitor_id),
+            scope=groups,
+        )
+        self._invalidate_cache()
         self.logger.info("Monitor unmuted", extra={"monitor_id": monitor_id})
 
     def get_monitor_events(self, monitor_id: str):
         self.logger.info("Getting monitor events", extra={"monitor_id": monitor_id})
-        with ApiClient(self.configuration) as api_client:
-            # tb: when it's out of beta, we should move to api v2
-            api = EventsApi(api_client)
-            end = datetime.datetime.now()
-            # tb: we can make timedelta configurable by the user if we want
-            start = datetime.datetime.now() - datetime.timedelta(days=1)
-            results = api.list_events(
-                start=int(start.timestamp()),
-                end=int(end.timestamp()),
+        # tb: when it's out of beta, we should move to api v2
+        api = EventsApi(self._api_client)
+        end = datetime.datetime.now()
+        # tb: we can make timedelta configurable by the user if we want
+        start = datetime.datetime.now() - datetime.timedelta(days=1)
+        # Filter out events that are related to this monitor only
+        # tb: We might want to exclude some fields from event.to_dict() but let's wait for user feedback
+        results = [
+            event.to_dict()
+            for event in self._iter_events(
+                api,
+                int(start.timestamp()),
+                int(end.timestamp()),
                 tags="source:alert",
             )
-            # Filter out events that are related to this monitor only
-            # tb: We might want to exclude some fields from event.to_dict() but let's wait for user feedback
-            results = [
-                event.to_dict()
-                for event in results.get("events", [])
-                if str(event.monitor_id) == str(monitor_id)
-            ]
-            self.logger.info(
-                "Monitor events retrieved", extra={"monitor_id": monitor_id}
-            )
-            return results
+            if str(event.monitor_id) == str(monitor_id)
+        ]
+        self.logger.info("Monitor events retrieved", extra={"monitor_id": monitor_id})
+        return results
+
+    def _cached_call(self, name: str, func: Callable, **kwargs) -> Any:
+        """
+        Call func(**kwargs) through the in-process TTL cache.
+
+        Args:
+            name (str): The name of the cached call, part of the cache key.
+            func (Callable): The function to call on a cache miss.
+
+        Returns:
+            Any: The (possibly cached) result of func(**kwargs).
+        """
+        key = (self._cache_namespace, name, frozenset(kwargs.items()))
+        now = time.monotonic()
+        with _cache_lock:
+            cached = _cache.get(key)
+            if cached and cached[0] > now:
+                return cached[1]
+        value = func(**kwargs)
+        with _cache_lock:
+            if len(_cache) >= _CACHE_MAXSIZE:
+                for expired_key in [k for k, v in _cache.items() if v[0] <= now]:
+                    del _cache[expired_key]
+                if len(_cache) >= _CACHE_MAXSIZE:
+                    # evict the oldest entry
+                    del _cache[next(iter(_cache))]
+            _cache[key] = (now + _CACHE_TTL_SECONDS, value)
+        return value
+
+    def _invalidate_cache(self):
+        """
+        Evict all the cached calls of this provider's credentials.
+        """
+        with _cache_lock:
+            for key in [k for k in _cache if k[0] == self._cache_namespace]:
+                del _cache[key]
 
     def dispose(self):
         """
         Dispose the provider.
         """
-        pass
+        self._invalidate_cache()
+        self._api_client.close()
 
     def validate_config(self):
         """
@@ -457,91 +603,103 @@ class DatadogProvider(BaseTopologyProvider):
     def validate_scopes(self):
         scopes = {}
         self.logger.info("Validating scopes")
-        with ApiClient(self.configuration) as api_client:
-            for scope in self.PROVIDER_SCOPES:
-                try:
-                    if scope.name == "monitors_read":
-                        api = MonitorsApi(api_client)
-                        api.list_monitors()
-                    elif scope.name == "monitors_write":
-                        api = MonitorsApi(api_client)
-                        body = Monitor(
-                            name="Example-Monitor",
-                            type=MonitorType.RUM_ALERT,
-                            query='formula("1 * 100").last("15m") >= 200',
-                            message="some message Notify: @hipchat-channel",
-                            tags=[
-                                "test:examplemonitor",
-                                "env:ci",
-                            ],
-                            priority=3,
-                            options=MonitorOptions(
-                                thresholds=MonitorThresholds(
-                                    critical=200,
-                                ),
-                                variables=[],
-                            ),
-                        )
-                        monitor = api.create_monitor(body)
-                        api.delete_monitor(monitor.id)
-                    elif scope.name == "create_webhooks":
-                        api = WebhooksIntegrationApi(api_client)
-                        # We check if we have permissions to query webhooks, this means we have the create_webhooks scope
-                        try:
-                            api.create_webhooks_integration(
-                                body={
-                                    "name": "keep-webhook-scope-validation",
-                                    "url": "https://example.com",
-                                }
-                            )
-                            # for some reason create_webhooks does not allow to delete: api.delete_webhooks_integration(webhook_name), no scope for deletion
-                        except ApiException as e:
-                            # If it's something different from 403 it means we have access! (for example, already exists because we created it once)
-                            if e.status == 403:
-                                raise e
-                    elif scope.name == "metrics_read":
-                        api = MetricsApi(api_client)
-                        api.query_metrics(
-                            query="system.cpu.idle{*}",
-                            _from=int((datetime.datetime.now()).timestamp()),
-                            to=int(datetime.datetime.now().timestamp()),
-                        )
-                    elif scope.name == "logs_read":
-                        self._query(
-                            query="*",
-                            timeframe="1h",
-                            query_type="logs",
-                        )
-                    elif scope.name == "events_read":
-                        api = EventsApi(api_client)
-                        end = datetime.datetime.now()
-                        start = datetime.datetime.now() - datetime.timedelta(hours=1)
-                        api.list_events(
-                            start=int(start.timestamp()), end=int(end.timestamp())
-                        )
-                    elif scope.name == "apm_read":
-                        api_instance = ServiceDefinitionApi(api_client)
-                        api_instance.list_service_definitions(schema_version="v1")
-                    elif scope.name == "apm_service_catalog_read":
-                        endpoint = self.__get_service_deps_endpoint(api_client)
-                        epoch_time_one_year_ago = self.__get_epoch_one_year_ago()
-                        endpoint.call_with_http_info(
-                            env=self.authentication_config.environment,
-                            start=str(epoch_time_one_year_ago),
-                        )
-                except ApiException as e:
-                    # API failed and it means we're probably lacking some permissions
-                    # perhaps we should check if status code is 403 and otherwise mark as valid?
-                    self.logger.warning(
-                        f"Failed to validate scope {scope.name}",
-                        extra={"reason": e.reason, "code": e.status},
-                    )
-                    scopes[scope.name] = str(e.reason)
-                    continue
-                scopes[scope.name] = True
+        # the probes are independent round-trips, run them concurrently
+        with ThreadPoolExecutor(max_workers=len(self.PROVIDER_SCOPES)) as executor:
+            futures = {
+                scope.name: executor.submit(self._validate_scope, scope.name)
+                for scope in self.PROVIDER_SCOPES
+            }
+        for scope_name, future in futures.items():
+            try:
+                future.result()
+            except ApiException as e:
+                # API failed and it means we're probably lacking some permissions
+                # perhaps we should check if status code is 403 and otherwise mark as valid?
+                self.logger.warning(
+                    f"Failed to validate scope {scope_name}",
+                    extra={"reason": e.reason, "code": e.status},
+                )
+                scopes[scope_name] = str(e.reason)
+                continue
+            scopes[scope_name] = True
         self.logger.info("Scopes validated", extra=scopes)
         return scopes
 
+    def _validate_scope(self, scope_name: str):
+        """
+        Probe a single scope, raises ApiException if it is missing.
+
+        Args:
+            scope_name (str): The name of the scope to probe.
+        """
+        if scope_name == "monitors_read":
+            api = MonitorsApi(self._api_client)
+            api.list_monitors()
+        elif scope_name == "monitors_write":
+            api = MonitorsApi(self._api_client)
+            body = Monitor(
+                name="Example-Monitor",
+                type=MonitorType.RUM_ALERT,
+                query='formula("1 * 100").last("15m") >= 200',
+                message="some message Notify: @hipchat-channel",
+                tags=[
+                    "test:examplemonitor",
+                    "env:ci",
+                ],
+                priority=3,
+                options=MonitorOptions(
+                    thresholds=MonitorThresholds(
+                        critical=200,
+                    ),
+                    variables=[],
+                ),
+            )
+            monitor = api.create_monitor(body)
+            api.delete_monitor(monitor.id)
+        elif scope_name == "create_webhooks":
+            api = WebhooksIntegrationApi(self._api_client)
+            # We check if we have permissions to query webhooks, this means we have the create_webhooks scope
+            try:
+                api.create_webhooks_integration(
+                    body={
+                        "name": "keep-webhook-scope-validation",
+                        "url": "https://example.com",
+                    }
+                )
+                # for some reason create_webhooks does not allow to delete: api.delete_webhooks_integration(webhook_name), no scope for deletion
+            except ApiException as e:
+                # If it's something different from 403 it means we have access! (for example, already exists because we created it once)
+                if e.status == 403:
+                    raise e
+        elif scope_name == "metrics_read":
+            api = MetricsApi(self._api_client)
+            api.query_metrics(
+                query="system.cpu.idle{*}",
+                _from=int((datetime.datetime.now()).timestamp()),
+                to=int(datetime.datetime.now().timestamp()),
+            )
+        elif scope_name == "logs_read":
+            self._query(
+                query="*",
+                timeframe="1h",
+                query_type="logs",
+            )
+        elif scope_name == "events_read":
+            api = EventsApi(self._api_client)
+            end = datetime.datetime.now()
+            start = datetime.datetime.now() - datetime.timedelta(hours=1)
+            api.list_events(start=int(start.timestamp()), end=int(end.timestamp()))
+        elif scope_name == "apm_read":
+            api_instance = ServiceDefinitionApi(self._api_client)
+            api_instance.list_service_definitions(schema_version="v1")
+        elif scope_name == "apm_service_catalog_read":
+            endpoint = self.__get_service_deps_endpoint(self._api_client)
+            epoch_time_one_year_ago = self.__get_epoch_one_year_ago()
+            endpoint.call_with_http_info(
+                env=self.authentication_config.environment,
+                start=str(epoch_time_one_year_ago),
+            )
+
     def expose(self):
         return {
             "to": int(self.to.timestamp()) * 1000,
@@ -550,99 +708,186 @@ class DatadogProvider(BaseTopologyProvider):
 
     def _query(self, query="", timeframe="", query_type="", **kwargs: dict):
         timeframe_in_seconds = DatadogProvider.convert_to_seconds(timeframe)
-        self.to = datetime.datetime.fromtimestamp(time.time())
-        self._from = datetime.datetime.fromtimestamp(
-            time.time() - (timeframe_in_seconds)
-        )
+        # read the clock once so the window bounds don't drift apart
+        now = time.time()
+        self.to = datetime.datetime.fromtimestamp(now)
+        self._from = datetime.datetime.fromtimestamp(now - timeframe_in_seconds)
         if query_type == "logs":
-            with ApiClient(self.configuration) as api_client:
-                api = LogsApi(api_client)
-                results = api.list_logs(
-                    body={
-                        "query": query,
-                        "time": {
-                            "_from": self._from,
-                            "to": self.to,
-                        },
-                    }
-                )
+            api = LogsApi(self._api_client)
+            results = api.list_logs(
+                body={
+                    "query": query,
+                    "time": {
+                        "_from": self._from,
+                        "to": self.to,
+                    },
+                }
+            )
         elif query_type == "metrics":
-            with ApiClient(self.configuration) as api_client:
-                api = MetricsApi(api_client)
-                results = api.query_metrics(
-                    query=query,
-                    _from=time.time() - (timeframe_in_seconds * 1000),
-                    to=time.time(),
-                )
+            api = MetricsApi(self._api_client)
+            results = api.query_metrics(
+                query=query,
+                _from=now - (timeframe_in_seconds * 1000),
+                to=now,
+            )
         return results
 
     def get_alerts_configuration(self, alert_id: str | None = None):
-        with ApiClient(self.configuration) as api_client:
-            api = MonitorsApi(api_client)
-            try:
-                monitors = api.list_monitors()
-            except Exception as e:
-                raise GetAlertException(message=str(e), status_code=e.status)
-            monitors = [
-                json.dumps(monitor.to_dict(), default=str) for monitor in monitors
-            ]
+        api = MonitorsApi(self._api_client)
+        try:
             if alert_id:
-                monitors = list(
-                    filter(lambda monitor: monitor["id"] == alert_id, monitors)
-                )
+                # fetch only the requested monitor instead of filtering the list
+                monitors = [api.get_monitor(int(alert_id))]
+            else:
+                monitors = self._cached_call("list_monitors", api.list_monitors)
+        except Exception as e:
+            raise GetAlertException(
+                message=str(e), status_code=getattr(e, "status", 400)
+            )
+        monitors = [json.dumps(monitor.to_dict(), default=str) for monitor in monitors]
         return monitors
 
+    def _iter_events(self, api: EventsApi, start: int, end: int, tags: str):
+        """
+        Iterate over the events between start and end, page by page.
+
+        The v1 events API returns at most EVENTS_PAGE_SIZE events per call,
+        so a single call silently truncates busy timeframes. The page
+        parameter is only honoured with exclude_aggregate (or unaggregated),
+        which also keeps rolled-up aggregate events out of the results.
+
+        Args:
+            api (EventsApi): The events api to use.
+            start (int): POSIX timestamp to start from.
+            end (int): POSIX timestamp to end at.
+            tags (str): Comma separated tags to filter by.
+
+        Yields:
+            Event: The events, page by page.
+        """
+        page = 0
+        previous_ids = None
+        while True:
+            events = api.list_events(
+                start=start, end=end, tags=tags, exclude_aggregate=True, page=page
+            ).get("events", [])
+            ids = [event.id for event in events]
+            # the api ignored the page parameter, don't loop over the same events
+            if ids == previous_ids:
+                self.logger.warning(
+                    "Events page repeated, stopping pagination",
+                    extra={"start": start, "end": end, "page": page},
+                )
+                return
+            yield from events
+            if len(events) < DatadogProvider.EVENTS_PAGE_SIZE:
+                return
+            previous_ids = ids
+            page += 1
+
+    def _list_events_window(self, api: EventsApi, start: int, end: int) -> list:
+        return list(self._iter_events(api, start, end, tags="source:alert"))
+
+    @staticmethod
+    def _iter_windows(futures: deque) -> Iterator:
+        """
+        Iterate over the events of the fetched windows, in order.
+
+        Each window is dropped from the queue before its events are read, so
+        it can be freed as soon as it has been consumed.
+
+        Args:
+            futures (deque[Future]): The futures of the windows' event lists.
+
+        Yields:
+            Event: The events, window by window.
+        """
+        while futures:
+            yield from futures.popleft().result()
+
+    def _get_monitors_index(self) -> dict:
+        """
+        Index the monitors by id, keeping only what _get_alerts reads.
+
+        Returns:
+            dict: monitor id -> (matching downtimes, creator email).
+        """
+        api = MonitorsApi(self._api_client)
+        index = {}
+        for monitor in api.list_monitors(with_downtimes=True):
+            # reading an unset model field raises, these are optional
+            creator = monitor.get("creator")
+            index[monitor.id] = (
+                monitor.get("matching_downtimes", []),
+                creator.get("email") if creator else None,
+            )
+        return index
+
     def _get_alerts(self) -> list[AlertDto]:
-        formatted_alerts = []
-        with ApiClient(self.configuration) as api_client:
+        return list(self._iter_alerts())
+
+    def _iter_alerts(self) -> Iterator[AlertDto]:
+        """
+        Iterate over the alerts of the last 14 days as their events are fetched.
+
+        Yields:
+            AlertDto: The alerts, window by window.
+        """
+        executor = ThreadPoolExecutor(max_workers=DatadogProvider.EVENTS_MAX_WORKERS)
+        try:
             # tb: when it's out of beta, we should move to api v2
             # https://docs.datadoghq.com/api/latest/events/
-            monitors_api = MonitorsApi(api_client)
-            all_monitors = {
-                monitor.id: monitor
-                for monitor in monitors_api.list_monitors(with_downtimes=True)
-            }
-            api = EventsApi(api_client)
-            end = datetime.datetime.now()
+            api = EventsApi(self._api_client)
+            end = int(datetime.datetime.now().timestamp())
             # tb: we can make timedelta configurable by the user if we want
-            start = datetime.datetime.now() - datetime.timedelta(days=14)
-            results = api.list_events(
-                start=int(start.timestamp()),
-                end=int(end.timestamp()),
-                tags="source:alert",
+            # start and end are inclusive, so this spans exactly 14 days of windows
+            start = end - int(datetime.timedelta(days=14).total_seconds()) + 1
+            step = int(DatadogProvider.EVENTS_WINDOW.total_seconds())
+            monitors_future = executor.submit(
+                self._cached_call,
+                "monitors_index",
+                self._get_monitors_index,
+            )
+            # windows are inclusive on both ends so they must not overlap
+            events_futures = deque(
+                executor.submit(
+                    self._list_events_window,
+                    api,
+                    window_start,
+                    min(window_start + step - 1, end),
+                )
+                for window_start in range(start, end + 1, step)
             )
-            events = results.get("events", [])
-            for event in events:
+            all_monitors = monitors_future.result()
+            default_fingerprint = self.fingerprint_fields == self.FINGERPRINT_FIELDS
+            # many events share a monitor and groups, check their downtimes once
+            muted: dict[tuple, bool] = {}
+            # parse each window as soon as it's fetched while the next ones load
+            for event in DatadogProvider._iter_windows(events_futures):
                 try:
-                    tags = {
-                        k: v
-                        for k, v in map(
-                            lambda tag: tag.split(":", 1),
-                            [tag for tag in event.tags if ":" in tag],
-                        )
-                    }
-                    severity, status, title = event.title.split(" ", 2)
-                    severity = severity.lstrip("[").rstrip("]")
+                    tags = _parse_tags(event.tags)
+                    severity, status, title = _TITLE_RE.match(event.title).groups()
                     severity = DatadogProvider.SEVERITIES_MAP.get(
                         severity, AlertSeverity.INFO
                     )
-                    status = status.lstrip("[").rstrip("]")
                     received = datetime.datetime.fromtimestamp(
                         event.get("date_happened")
                     )
-                    monitor = all_monitors.get(event.monitor_id)
-                    is_muted = (
-                        False
-                        if not monitor
-                        else any(
-                            [
-                                downtime
-                                for downtime in monitor.matching_downtimes
-                                if downtime.groups == event.monitor_groups
-                                or downtime.scope == ["*"]
-                            ]
-                        )
+                    matching_downtimes, created_by = all_monitors.get(
+                        event.monitor_id, ((), None)
                     )
+                    groups = event.monitor_groups
+                    muted_key = (
+                        event.monitor_id,
+                        tuple(groups) if groups is not None else None,
+                    )
+                    is_muted = muted.get(muted_key)
+                    if is_muted is None:
+                        # stops at the first matching downtime
+                        is_muted = muted[muted_key] = any(
+                            downtime.groups == groups or downtime.scope == ["*"]
+                            for downtime in matching_downtimes
+                        )
 
                     status = (
                         DatadogProvider.STATUS_MAP.get(status, AlertStatus.FIRING)
@@ -664,143 +909,143 @@ class DatadogProvider(BaseTopologyProvider):
                         tags=tags,
                         environment=tags.get("environment", "undefined"),
                         service=tags.get("service"),
-                        created_by=(
-                            monitor.creator.email
-                            if monitor and monitor.creator
-                            else None
-                        ),
+                        created_by=created_by,
                     )
-                    alert.fingerprint = self.get_alert_fingerprint(
-                        alert, self.fingerprint_fields
+                    alert.fingerprint = (
+                        _get_fingerprint(event.monitor_groups, event.monitor_id)
+                        if default_fingerprint
+                        else self.get_alert_fingerprint(alert, self.fingerprint_fields)
                     )
-                    formatted_alerts.append(alert)
                 except Exception:
                     self.logger.exception(
                         "Could not parse alert event",
                         extra={"event_id": event.id, "monitor_id": event.monitor_id},
                     )
                     continue
-        return formatted_alerts
+                yield alert
+        finally:
+            # don't fetch the remaining windows if the consumer stopped early
+            executor.shutdown(cancel_futures=True)
 
     def setup_webhook(
         self, tenant_id: str, keep_api_url: str, api_key: str, setup_alerts: bool = True
     ):
         self.logger.info("Creating or updating webhook")
         webhook_name = f"{DatadogProviderAuthConfig.KEEP_DATADOG_WEBHOOK_INTEGRATION_NAME}-{tenant_id}"
-        with ApiClient(self.configuration) as api_client:
-            api = WebhooksIntegrationApi(api_client)
+        # built once, shared by the update/create/recreate branches
+        body = DatadogProvider._build_webhook_body(keep_api_url, api_key)
+        api = WebhooksIntegrationApi(self._api_client)
+        try:
+            webhook = api.get_webhooks_integration(webhook_name=webhook_name)
+            if webhook.url != keep_api_url:
+                api.update_webhooks_integration(webhook.name, body=body)
+                self.logger.info(
+                    "Webhook updated",
+                )
+        except (NotFoundException, ForbiddenException):
             try:
-                webhook = api.get_webhooks_integration(webhook_name=webhook_name)
-                if webhook.url != keep_api_url:
-                    api.update_webhooks_integration(
-                        webhook.name,
-                        body={
-                            "url": keep_api_url,
-                            "custom_headers": json.dumps(
-                                {
-                                    "Content-Type": "application/json",
-                                    "X-API-KEY": api_key,
-                                }
-                            ),
-                            "payload": DatadogProvider.WEBHOOK_PAYLOAD,
-                        },
-                    )
+                webhook = api.create_webhooks_integration(
+                    body={**body, "name": webhook_name, "encode_as": "json"}
+                )
+                self.logger.info("Webhook created")
+            except ApiException as exc:
+                if "Webhook already exists" in exc.body.get("errors"):
                     self.logger.info(
-                        "Webhook updated",
+                        "Webhook already exists when trying to add, updating"
                     )
-            except (NotFoundException, ForbiddenException):
+                    try:
+                        api.update_webhooks_integration(webhook_name, body=body)
+                    except ApiException:
+                        self.logger.exception("Failed to update webhook")
+                else:
+                    raise
+        self.logger.info("Webhook created or updated")
+        if setup_alerts:
+            self.logger.info("Updating monitors")
+            api = MonitorsApi(self._api_client)
+            monitors = api.list_monitors()
+            webhook_mention = f"@webhook-{webhook_name}"
+            monitors_to_update = []
+            for monitor in monitors:
+                # reading an unset model field raises, message is optional
+                message = monitor.get("message") or ""
+                if webhook_mention not in message:
+                    monitors_to_update.append((monitor, f"{message} {webhook_mention}"))
+            # every update is a round-trip, issue them concurrently
+            with ThreadPoolExecutor(
+                max_workers=DatadogProvider.MONITORS_UPDATE_MAX_WORKERS
+            ) as executor:
+                for monitor, message in monitors_to_update:
+                    executor.submit(self._update_monitor_message, api, monitor, message)
+            self._invalidate_cache()
+            self.logger.info("Monitors updated")
+
+    @staticmethod
+    def _build_webhook_body(keep_api_url: str, api_key: str) -> dict:
+        """
+        Build the webhook integration body used to create or update Keep's webhook.
+
+        Args:
+            keep_api_url (str): The Keep url Datadog should post alerts to.
+            api_key (str): The Keep api key sent along with every alert.
+
+        Returns:
+            dict: url, custom headers and payload of the webhook.
+        """
+        return {
+            "url": keep_api_url,
+            "custom_headers": json.dumps(
+                {
+                    "Content-Type": "application/json",
+                    "X-API-KEY": api_key,
+                }
+            ),
+            "payload": DatadogProvider.WEBHOOK_PAYLOAD,
+        }
+
+    def _update_monitor_message(self, api: MonitorsApi, monitor: Monitor, message: str):
+        """
+        Update the message of a monitor, backing off while Datadog rate limits us.
+
+        Args:
+            api (MonitorsApi): The monitors api to use.
+            monitor (Monitor): The monitor to update.
+            message (str): The new message of the monitor.
+        """
+        # get() can't raise on unset fields, so every failure below is logged
+        extra = {"monitor_id": monitor.get("id"), "monitor_name": monitor.get("name")}
+        self.logger.info("Updating monitor", extra=extra)
+        try:
+            for attempt in range(DatadogProvider.MONITORS_UPDATE_RETRIES + 1):
                 try:
-                    webhook = api.create_webhooks_integration(
-                        body={
-                            "name": webhook_name,
-                            "url": keep_api_url,
-                            "custom_headers": json.dumps(
-                                {
-                                    "Content-Type": "application/json",
-                                    "X-API-KEY": api_key,
-                                }
-                            ),
-                            "encode_as": "json",
-                            "payload": DatadogProvider.WEBHOOK_PAYLOAD,
-                        }
-                    )
-                    self.logger.info("Webhook created")
-                except ApiException as exc:
-                    if "Webhook already exists" in exc.body.get("errors"):
-                        self.logger.info(
-                            "Webhook already exists when trying to add, updating"
-                        )
-                        try:
-                            api.update_webhooks_integration(
-                                webhook_name,
-                                body={
-                                    "url": keep_api_url,
-                                    "custom_headers": json.dumps(
-                                        {
-                                            "Content-Type": "application/json",
-                                            "X-API-KEY": api_key,
-                                        }
-                                    ),
-                                    "payload": DatadogProvider.WEBHOOK_PAYLOAD,
-                                },
-                            )
-                        except ApiException:
-                            self.logger.exception("Failed to update webhook")
-                    else:
+                    api.update_monitor(monitor.id, body={"message": message})
+                    break
+                except ApiException as e:
+                    if (
+                        e.status != 429
+                        or attempt == DatadogProvider.MONITORS_UPDATE_RETRIES
+                    ):
                         raise
-            self.logger.info("Webhook created or updated")
-            if setup_alerts:
-                self.logger.info("Updating monitors")
-                api = MonitorsApi(api_client)
-                monitors = api.list_monitors()
-                for monitor in monitors:
-                    try:
-                        self.logger.info(
-                            "Updating monitor",
-                            extra={
-                                "monitor_id": monitor.id,
-                                "monitor_name": monitor.name,
-                            },
+                    # seconds until the rate limit period resets, header names
+                    # are case insensitive but e.headers is a plain dict
+                    headers = {k.lower(): v for k, v in (e.headers or {}).items()}
+                    reset = str(headers.get("x-ratelimit-reset", ""))
+                    time.sleep(
+                        min(
+                            int(reset) if reset.isdigit() else 2**attempt,
+                            DatadogProvider.MONITORS_UPDATE_MAX_BACKOFF,
                         )
-                        monitor_message = monitor.message
-                        if f"@webhook-{webhook_name}" not in monitor_message:
-                            monitor_message = (
-                                f"{monitor_message} @webhook-{webhook_name}"
-                            )
-                            api.update_monitor(
-                                monitor.id, body={"message": monitor_message}
-                            )
-                            self.logger.info(
-                                "Monitor updated",
-                                extra={
-                                    "monitor_id": monitor.id,
-                                    "monitor_name": monitor.name,
-                                },
-                            )
-                    except Exception:
-                        self.logger.exception(
-                            "Could not update monitor",
-                            extra={
-                                "monitor_id": monitor.id,
-                                "monitor_name": monitor.name,
-                            },
-                        )
-                self.logger.info("Monitors updated")
+                    )
+            self.logger.info("Monitor updated", extra=extra)
+        except Exception:
+            self.logger.exception("Could not update monitor", extra=extra)
 
     @staticmethod
     def _format_alert(
         event: dict, provider_instance: "BaseTopologyProvider" = None
     ) -> AlertDto:
-        tags_list = event.get("tags", "").split(",")
-        tags_list.remove("monitor")
-
-        try:
-            tags = {k: v for k, v in map(lambda tag: tag.split(":"), tags_list)}
-        except Exception as e:
-            logger.error(
-                "Failed to parse tags", extra={"error": str(e), "tags": tags_list}
-            )
-            tags = {}
+        # the bare "monitor" tag has no value so it is skipped
+        tags = _parse_tags((event.get("tags") or "").split(","))
 
         event_time = datetime.datetime.fromtimestamp(
             int(event.get("last_updated")) / 1000, tz=datetime.timezone.utc
@@ -810,19 +1055,20 @@ class DatadogProvider(BaseTopologyProvider):
         status = DatadogProvider.STATUS_MAP.get(
             event.get("alert_transition"), AlertStatus.FIRING
         )
-        severity = DatadogProvider.SEVERITIES_MAP.get(
-            event.get("severity"), AlertSeverity.INFO
-        )
+        severity = event.get("severity")
+        if not severity and title:
+            # $ALERT_PRIORITY is empty for monitors without a priority,
+            # fall back to the "[P1]" prefix of the title if there is one
+            severity = _TITLE_RE.match(title).group(1)
+        severity = DatadogProvider.SEVERITIES_MAP.get(severity, AlertSeverity.INFO)
         service = tags.get("service")
 
         url = event.pop("url", None)
 
         # https://docs.datadoghq.com/integrations/webhooks/#variables
-        groups = event.get("scopes", "")
-        if not groups:
-            groups = ["*"]
-        else:
-            groups = groups.split(",")
+        groups = event.get("scopes")
+        groups = groups.split(",") if groups else ["*"]
+        monitor_id = event.get("monitor_id")
 
         alert = AlertDto(
             id=event.get("id"),
@@ -836,33 +1082,31 @@ class DatadogProvider(BaseTopologyProvider):
             service=service,
             url=url,
             tags=tags,
-            monitor_id=event.get("monitor_id"),
-        )
-        alert.fingerprint = DatadogProvider.get_alert_fingerprint(
-            alert, DatadogProvider.FINGERPRINT_FIELDS
+            monitor_id=monitor_id,
         )
+        alert.fingerprint = _get_fingerprint(groups, monitor_id)
         return alert
 
     def deploy_alert(self, alert: dict, alert_id: str | None = None):
         body = Monitor(**alert)
-        with ApiClient(self.configuration) as api_client:
-            api_instance = MonitorsApi(api_client)
-            try:
-                response = api_instance.create_monitor(body=body)
-            except Exception as e:
-                raise Exception({"message": e.body["errors"][0]})
+        api_instance = MonitorsApi(self._api_client)
+        try:
+            response = api_instance.create_monitor(body=body)
+        except Exception as e:
+            raise Exception({"message": e.body["errors"][0]})
+        self._invalidate_cache()
         return response
 
     def get_logs(self, limit: int = 5) -> list:
         # Logs from the last 7 days
         timeframe_in_seconds = DatadogProvider.convert_to_seconds("7d")
-        _from = datetime.datetime.fromtimestamp(time.time() - (timeframe_in_seconds))
-        to = datetime.datetime.fromtimestamp(time.time())
-        with ApiClient(self.configuration) as api_client:
-            api = LogsApi(api_client)
-            results = api.list_logs(
-                body={"limit": limit, "time": {"_from": _from, "to": to}}
-            )
+        now = time.time()
+        _from = datetime.datetime.fromtimestamp(now - timeframe_in_seconds)
+        to = datetime.datetime.fromtimestamp(now)
+        api = LogsApi(self._api_client)
+        results = api.list_logs(
+            body={"limit": limit, "time": {"_from": _from, "to": to}}
+        )
         return [log.to_dict() for log in results["logs"]]
 
     @staticmethod
@@ -946,17 +1190,14 @@ class DatadogProvider(BaseTopologyProvider):
 
     def pull_topology(self) -> list[TopologyServiceInDto]:
         services = {}
-        with ApiClient(self.configuration) as api_client:
-            api_instance = ServiceDefinitionApi(api_client)
-            service_definitions = api_instance.list_service_definitions(
-                schema_version="v1"
-            )
-            epoch_time_one_year_ago = self.__get_epoch_one_year_ago()
-            endpoint = self.__get_service_deps_endpoint(api_client)
-            service_dependencies = endpoint.call_with_http_info(
-                env=self.authentication_config.environment,
-                start=str(epoch_time_one_year_ago),
-            )
+        api_instance = ServiceDefinitionApi(self._api_client)
+        service_definitions = api_instance.list_service_definitions(schema_version="v1")
+        epoch_time_one_year_ago = self.__get_epoch_one_year_ago()
+        endpoint = self.__get_service_deps_endpoint(self._api_client)
+        service_dependencies = endpoint.call_with_http_info(
+            env=self.authentication_config.environment,
+            start=str(epoch_time_one_year_ago),
+        )
 
         # Parse data
         environment = self.authentication_config.environment
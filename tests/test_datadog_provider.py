@@ -0,0 +1,399 @@
+import logging
+import time
+from collections import deque
+from unittest.mock import MagicMock, patch
+
+import pytest
+from datadog_api_client.exceptions import ApiException
+from datadog_api_client.v1.model.creator import Creator
+from datadog_api_client.v1.model.monitor import Monitor
+
+from keep.api.models.alert import AlertSeverity, AlertStatus
+from keep.contextmanager.contextmanager import ContextManager
+from keep.providers.datadog_provider import datadog_provider
+from keep.providers.datadog_provider.datadog_provider import (
+    _TITLE_RE,
+    DatadogProvider,
+    _parse_tags,
+)
+from keep.providers.models.provider_config import ProviderConfig
+
+DATADOG_MODULE = "keep.providers.datadog_provider.datadog_provider"
+
+
+def _webhook_event(**overrides) -> dict:
+    event = {
+        "id": "123",
+        "title": "[P2] [Triggered] CPU high",
+        "body": "CPU is above 90%",
+        "last_updated": "1700000000000",
+        "alert_transition": "Triggered",
+        "severity": "P2",
+        "scopes": "host:a",
+        "tags": "monitor,service:api,env:prod",
+        "monitor_id": "42",
+        "url": "https://app.datadoghq.com/monitors/42",
+    }
+    event.update(overrides)
+    return event
+
+
+def test_parse_tags():
+    tags = _parse_tags(["monitor", "service:api", "url:https://a:8080/x", ""])
+    assert tags == {"service": "api", "url": "https://a:8080/x"}
+
+
+def test_format_alert():
+    alert = DatadogProvider._format_alert(_webhook_event())
+    assert alert.name == "[P2] [Triggered] CPU high"
+    assert alert.status == AlertStatus.FIRING.value
+    assert alert.severity == AlertSeverity.HIGH.value
+    assert alert.service == "api"
+    assert alert.tags == {"service": "api", "env": "prod"}
+    assert alert.groups == ["host:a"]
+    assert alert.monitor_id == "42"
+    assert alert.fingerprint == DatadogProvider.get_alert_fingerprint(
+        alert, DatadogProvider.FINGERPRINT_FIELDS
+    )
+
+
+@pytest.mark.parametrize("tags", [None, "", "service:api"])
+def test_format_alert_without_monitor_tag(tags):
+    alert = DatadogProvider._format_alert(_webhook_event(tags=tags))
+    assert "monitor" not in alert.tags
+
+
+def test_format_alert_multi_colon_tags():
+    alert = DatadogProvider._format_alert(
+        _webhook_event(tags="monitor,url:https://a:8080/x,version:1:2")
+    )
+    assert alert.tags == {"url": "https://a:8080/x", "version": "1:2"}
+
+
+def test_format_alert_without_severity_uses_title_priority():
+    alert = DatadogProvider._format_alert(_webhook_event(severity=""))
+    assert alert.severity == AlertSeverity.HIGH.value
+    alert = DatadogProvider._format_alert(
+        _webhook_event(severity="", title="[Triggered] CPU high")
+    )
+    assert alert.severity == AlertSeverity.INFO.value
+
+
+def test_format_alert_without_scopes():
+    alert = DatadogProvider._format_alert(_webhook_event(scopes=""))
+    assert alert.groups == ["*"]
+
+
+@pytest.mark.parametrize(
+    "timeframe, seconds",
+    [("30s", 30), ("15m", 900), ("1h", 3600), ("7d", 604800), ("2w", 1209600)],
+)
+def test_convert_to_seconds(timeframe, seconds):
+    assert DatadogProvider.convert_to_seconds(timeframe) == seconds
+    # instance calls used to pass self as the timeframe
+    provider = object.__new__(DatadogProvider)
+    assert provider.convert_to_seconds(timeframe) == seconds
+
+
+@pytest.mark.parametrize("timeframe", ["", "h", "1x", "1.5h", "-1h", "1 h", "1h\n"])
+def test_convert_to_seconds_invalid(timeframe):
+    with pytest.raises(ValueError):
+        DatadogProvider.convert_to_seconds(timeframe)
+
+
+@pytest.mark.parametrize(
+    "title, expected",
+    [
+        ("[P1] [Triggered] CPU high", ("P1", "Triggered", "CPU high")),
+        ("[Triggered] CPU high", (None, "Triggered", "CPU high")),
+        (
+            "[P2] [Recovered on {host:a}] CPU high",
+            ("P2", "Recovered", "CPU high"),
+        ),
+        (
+            "[P3] [Muted on {host:a,env:prod}] CPU high",
+            ("P3", "Muted", "CPU high"),
+        ),
+        ("[P1] [Re-Triggered] CPU high", ("P1", "Re-Triggered", "CPU high")),
+        ("[P1] [No Data] CPU high", ("P1", "No Data", "CPU high")),
+        (
+            "[P1] [Re-Triggered on {host:a}] CPU high",
+            ("P1", "Re-Triggered", "CPU high"),
+        ),
+        ("CPU high", (None, None, "CPU high")),
+    ],
+)
+def test_title_re(title, expected):
+    assert _TITLE_RE.match(title).groups() == expected
+
+
+def test_monitors_index_with_unset_optional_fields():
+    # _spec_property_naming builds the models the way the api client deserializes them
+    with_creator = Monitor(
+        id=1,
+        query="q",
+        type="metric alert",
+        creator=Creator(email="a@b.c"),
+        matching_downtimes=[],
+        _spec_property_naming=True,
+    )
+    # no creator and no matching_downtimes, reading them raises ApiAttributeError
+    bare = Monitor(id=2, query="q", type="metric alert", _spec_property_naming=True)
+    provider = object.__new__(DatadogProvider)
+    provider._api_client = None
+    with patch(f"{DATADOG_MODULE}.MonitorsApi") as monitors_api:
+        monitors_api.return_value.list_monitors.return_value = [with_creator, bare]
+        index = provider._get_monitors_index()
+    assert index == {1: ([], "a@b.c"), 2: ([], None)}
+
+
+def test_update_monitor_message_rate_limit_backoff():
+    rate_limited = ApiException(status=429, reason="Too Many Requests")
+    # header names are case insensitive, the cap bounds the server's hint
+    rate_limited.headers = {"x-ratelimit-reset": "3600"}
+    api = MagicMock()
+    api.update_monitor.side_effect = [rate_limited, None]
+    monitor = Monitor(
+        id=1, name="m", query="q", type="metric alert", _spec_property_naming=True
+    )
+    provider = object.__new__(DatadogProvider)
+    provider.logger = logging.getLogger(__name__)
+    with patch(f"{DATADOG_MODULE}.time.sleep") as sleep:
+        provider._update_monitor_message(api, monitor, "message")
+    sleep.assert_called_once_with(DatadogProvider.MONITORS_UPDATE_MAX_BACKOFF)
+    assert api.update_monitor.call_count == 2
+
+
+def test_oauth_cache_namespace_survives_token_refresh():
+    def oauth_provider(access_token):
+        response = MagicMock(ok=True)
+        response.json.return_value = {
+            "access_token": access_token,
+            "refresh_token": "refresh",
+        }
+        config = ProviderConfig(
+            authentication={"oauth_token": {"refresh_token": "refresh"}}
+        )
+        with patch(
+            f"{DATADOG_MODULE}.requests.post",
+            return_value=response,
+        ):
+            return DatadogProvider(
+                ContextManager(tenant_id="tenant"), "datadog-oauth", config
+            )
+
+    first, second = oauth_provider("token-1"), oauth_provider("token-2")
+    assert first._cache_namespace == second._cache_namespace
+
+
+def test_setup_webhook_updates_monitors_without_message():
+    # message is optional, reading it unset raises ApiAttributeError
+    bare = Monitor(
+        id=1, name="m", query="q", type="metric alert", _spec_property_naming=True
+    )
+    mentioned = Monitor(
+        id=2,
+        query="q",
+        type="metric alert",
+        message="hi @webhook-keep-datadog-webhook-integration-tenant",
+        _spec_property_naming=True,
+    )
+    provider = object.__new__(DatadogProvider)
+    provider.logger = logging.getLogger(__name__)
+    provider._api_client = None
+    provider._cache_namespace = "test"
+    with patch(f"{DATADOG_MODULE}.WebhooksIntegrationApi") as webhooks_api, patch(
+        f"{DATADOG_MODULE}.MonitorsApi"
+    ) as monitors_api:
+        webhooks_api.return_value.get_webhooks_integration.return_value.url = "url"
+        monitors_api.return_value.list_monitors.return_value = [bare, mentioned]
+        provider.setup_webhook("tenant", "url", "api-key")
+    monitors_api.return_value.update_monitor.assert_called_once_with(
+        1, body={"message": " @webhook-keep-datadog-webhook-integration-tenant"}
+    )
+
+
+def test_update_monitor_message_without_name():
+    # name is optional, reading it unset raises ApiAttributeError
+    monitor = Monitor(id=1, query="q", type="metric alert", _spec_property_naming=True)
+    api = MagicMock()
+    provider = object.__new__(DatadogProvider)
+    provider.logger = logging.getLogger(__name__)
+    provider._update_monitor_message(api, monitor, "message")
+    api.update_monitor.assert_called_once_with(1, body={"message": "message"})
+
+
+class _Event(dict):
+    """Minimal stand-in for a datadog Event, attribute and get() access."""
+
+    __getattr__ = dict.__getitem__
+
+
+def _alert_event(event_id: int) -> _Event:
+    return _Event(
+        id=event_id,
+        title="[P1] [Triggered] CPU high",
+        text="CPU is above 90%",
+        tags=["service:api"],
+        date_happened=1700000000,
+        monitor_id=42,
+        monitor_groups=["host:a"],
+    )
+
+
+def _events_provider() -> DatadogProvider:
+    provider = object.__new__(DatadogProvider)
+    provider.logger = logging.getLogger(__name__)
+    provider._api_client = None
+    provider.fingerprint_fields = DatadogProvider.FINGERPRINT_FIELDS
+    provider._cached_call = lambda name, func, **kwargs: {}
+    return provider
+
+
+def test_iter_alerts_reads_every_window_in_order():
+    provider = _events_provider()
+    windows = iter(range(100))
+    with patch.object(
+        DatadogProvider,
+        "_list_events_window",
+        side_effect=lambda api, start, end: [_alert_event(next(windows))],
+    ):
+        alerts = provider._get_alerts()
+    # 14 days of 1 day windows
+    assert len(alerts) == 14
+    assert alerts[0].status == AlertStatus.FIRING.value
+    assert alerts[0].name == "CPU high"
+
+
+def test_iter_windows_releases_consumed_windows():
+    futures = deque(MagicMock(**{"result.return_value": [i, i]}) for i in range(3))
+    events = DatadogProvider._iter_windows(futures)
+    assert next(events) == 0
+    # the first window was taken off the queue once it started being read
+    assert len(futures) == 2
+    assert list(events) == [0, 1, 1, 2, 2]
+    assert not futures
+
+
+def test_iter_alerts_stops_fetching_when_closed_early():
+    provider = _events_provider()
+    fetched = []
+
+    def list_events_window(api, start, end):
+        time.sleep(0.01)
+        fetched.append(start)
+        return [_alert_event(len(fetched))]
+
+    with patch.object(DatadogProvider, "EVENTS_MAX_WORKERS", 1), patch.object(
+        DatadogProvider, "_list_events_window", side_effect=list_events_window
+    ):
+        alerts = provider._iter_alerts()
+        next(alerts)
+        alerts.close()
+    # the pending windows were cancelled instead of fetched
+    assert len(fetched) < 14
+
+
+def _events_page(first_id: int, size: int) -> dict:
+    return {"events": [_Event(id=i) for i in range(first_id, first_id + size)]}
+
+
+def test_iter_events_pages_until_a_short_page():
+    page_size = DatadogProvider.EVENTS_PAGE_SIZE
+    api = MagicMock()
+    api.list_events.side_effect = [
+        _events_page(0, page_size),
+        _events_page(page_size, 3),
+    ]
+    events = list(_events_provider()._iter_events(api, 1, 2, tags="source:alert"))
+    assert [event.id for event in events] == list(range(page_size + 3))
+    assert [call.kwargs["page"] for call in api.list_events.call_args_list] == [0, 1]
+    # page is ignored by the api unless aggregates are excluded
+    assert all(
+        call.kwargs["exclude_aggregate"] for call in api.list_events.call_args_list
+    )
+
+
+def test_iter_events_stops_on_a_repeated_page(caplog):
+    full_page = _events_page(0, DatadogProvider.EVENTS_PAGE_SIZE)
+    api = MagicMock()
+    api.list_events.side_effect = [full_page, full_page, full_page]
+    with caplog.at_level(logging.WARNING):
+        events = list(_events_provider()._iter_events(api, 1, 2, tags="source:alert"))
+    assert len(events) == DatadogProvider.EVENTS_PAGE_SIZE
+    assert api.list_events.call_count == 2
+    assert "Events page repeated, stopping pagination" in caplog.text
+
+
+@pytest.fixture
+def cache():
+    datadog_provider._cache.clear()
+    yield datadog_provider._cache
+    datadog_provider._cache.clear()
+
+
+def _cached_provider(namespace: str) -> DatadogProvider:
+    provider = object.__new__(DatadogProvider)
+    provider.logger = logging.getLogger(__name__)
+    provider._api_client = None
+    provider._cache_namespace = namespace
+    return provider
+
+
+def test_cached_call_hits_within_ttl(cache):
+    provider = _cached_provider("a")
+    func = MagicMock(return_value="monitors")
+    with patch(f"{DATADOG_MODULE}.time.monotonic", return_value=1000):
+        assert provider._cached_call("list_monitors", func, page=1) == "monitors"
+    with patch(
+        f"{DATADOG_MODULE}.time.monotonic",
+        return_value=1000 + datadog_provider._CACHE_TTL_SECONDS - 1,
+    ):
+        assert provider._cached_call("list_monitors", func, page=1) == "monitors"
+    func.assert_called_once_with(page=1)
+    # other arguments are another entry
+    provider._cached_call("list_monitors", func, page=2)
+    assert func.call_count == 2
+
+
+def test_cached_call_misses_after_ttl(cache):
+    provider = _cached_provider("a")
+    func = MagicMock(side_effect=["old", "new"])
+    with patch(f"{DATADOG_MODULE}.time.monotonic", return_value=1000):
+        assert provider._cached_call("list_monitors", func) == "old"
+    with patch(
+        f"{DATADOG_MODULE}.time.monotonic",
+        return_value=1000 + datadog_provider._CACHE_TTL_SECONDS,
+    ):
+        assert provider._cached_call("list_monitors", func) == "new"
+    assert func.call_count == 2
+
+
+def test_cached_call_evicts_when_full(cache):
+    provider = _cached_provider("a")
+    with patch(f"{DATADOG_MODULE}._CACHE_MAXSIZE", 2):
+        for page in range(3):
+            provider._cached_call("list_monitors", lambda page: page, page=page)
+    assert len(cache) == 2
+    # the oldest entry was evicted
+    assert [key[2] for key in cache] == [
+        frozenset({("page", 1)}),
+        frozenset({("page", 2)}),
+    ]
+
+
+def test_invalidate_cache_only_evicts_own_namespace(cache):
+    first, second = _cached_provider("a"), _cached_provider("b")
+    first._cached_call("list_monitors", lambda: "a")
+    second._cached_call("list_monitors", lambda: "b")
+    first._invalidate_cache()
+    assert [key[0] for key in cache] == ["b"]
+
+
+def test_mute_monitor_invalidates_cache(cache):
+    provider = _cached_provider("a")
+    provider._cached_call("monitors_index", lambda: {})
+    with patch(f"{DATADOG_MODULE}.Endpoint") as endpoint:
+        provider.mute_monitor("42", groups=["host:a"])
+    endpoint.return_value.call_with_http_info.assert_called_once()
+    assert not cache